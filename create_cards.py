@@ -1,36 +1,61 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import sys
+import json
+import hashlib
 import argparse
-import pandas as pd
 import subprocess
 from pathlib import Path
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import jinja2
+import yaml
 
 
-def render_template(template_path, context):
+JINJA_CACHE_DIR = '.jinja_cache'
+
+# A "key: value" line plus any indented lines that continue it
+FRONT_MATTER_LINE_RE = re.compile(r'^([^\s:][^:\n]*?)[ \t]*:[ \t]*(.*?)[ \t\r]*((?:\n[ \t]+.*|\n[ \t\r]*(?=\n))*)$', re.M)
+
+# Cache of rendered per-card LaTeX, stored next to the output PDF
+CARD_CACHE_FILE = '.card_cache.json'
+# LaTeX engines that can typeset the cards, in the order pandoc falls back to them
+LATEX_ENGINES = ('xelatex', 'lualatex', 'pdflatex')
+
+# Packages that only work with xelatex
+XELATEX_PACKAGES_RE = re.compile(r'\\usepackage(?:\[[^\]]*\])?\{(?:fontspec|unicode-math|polyglossia)\}')
+
+# Front matter fields passed to the LaTeX template for each card
+CARD_FIELDS = ['name', 'title', 'contact', 'description', 'funders', 'feasible_3yr',
+               'opportunities', 'challenges']
+
+# Prefer the libyaml-backed loader; BaseLoader keeps every value a string,
+# so answers like "Yes" or "3" are not turned into booleans or numbers
+YamlLoader = getattr(yaml, 'CBaseLoader', yaml.BaseLoader)
+
+
+@lru_cache(maxsize=8)
+def _get_environment(template_dir):
     """
-    Render a Jinja2 template with the given context.
-    Uses block_start_string, block_end_string, etc. to avoid conflicts with LaTeX syntax.
+    Return a Jinja2 environment for the given template directory.
+    Environments are cached so templates are only parsed once per process, and
+    compiled templates are also cached on disk so later runs skip compilation.
     
     Args:
-        template_path (str): Path to the template file
-        context (dict): Dictionary of variables to use in the template
+        template_dir (str): Directory containing the templates
     
     Returns:
-        str: Rendered template content
+        jinja2.Environment: Environment with LaTeX-friendly delimiters
     """
-    template_dir = os.path.dirname(template_path)
-    template_file = os.path.basename(template_path)
-    
-    # Read the template file content
-    with open(template_path, 'r') as f:
-        template_content = f.read()
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
     
     # Set up Jinja2 environment with custom delimiters for LaTeX compatibility
-    env = jinja2.Environment(
+    return jinja2.Environment(
         loader=jinja2.FileSystemLoader(template_dir or './'),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(JINJA_CACHE_DIR),
         block_start_string='{% ',
         block_end_string=' %}',
         variable_start_string='{{',
@@ -42,26 +67,322 @@ def render_template(template_path, context):
         lstrip_blocks=True,
         autoescape=False  # Don't escape HTML - not needed for LaTeX
     )
+
+
+def _load_template(template_path):
+    """
+    Load a compiled Jinja2 template from the cached environment.
+    
+    Args:
+        template_path (str): Path to the template file
     
-    # Get the template from the environment
+    Returns:
+        jinja2.Template: The compiled template
+    """
+    template_dir = os.path.dirname(template_path)
+    template_file = os.path.basename(template_path)
+    env = _get_environment(template_dir)
+    
+    # Get the template from the environment; it is reloaded only if the file changed
     try:
-        template = env.get_template(template_file)
-        return template.render(**context)
+        return env.get_template(template_file)
     except Exception as e:
         # Fallback to direct string template if loading fails
         print(f"Warning: Using fallback template rendering method: {e}")
-        template = jinja2.Template(
-            template_content,
-            block_start_string='{% ',
-            block_end_string=' %}',
-            variable_start_string='{{',
-            variable_end_string='}}',
-            comment_start_string='{#',
-            comment_end_string='#}',
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        return template.render(**context)
+        with open(template_path, 'r') as f:
+            template_content = f.read()
+        return env.from_string(template_content)
+
+
+def render_template(template_path, context):
+    """
+    Render a Jinja2 template with the given context.
+    Uses block_start_string, block_end_string, etc. to avoid conflicts with LaTeX syntax.
+    
+    Args:
+        template_path (str): Path to the template file
+        context (dict): Dictionary of variables to use in the template
+    
+    Returns:
+        str: Rendered template content
+    """
+    return _load_template(template_path).render(**context)
+
+
+def render_template_to_file(template_path, context, output_path):
+    """
+    Render a Jinja2 template straight to a file.
+    The output is streamed in chunks, so the full document is never held in memory.
+    
+    Args:
+        template_path (str): Path to the template file
+        context (dict): Dictionary of variables to use in the template
+        output_path (str): Path of the file to write
+    """
+    _load_template(template_path).stream(**context).dump(output_path, encoding='utf-8')
+
+
+def read_card_files(cards_dir, max_workers=16):
+    """
+    Read every card markdown file in a directory.
+    Files are read on a thread pool so their I/O latency overlaps.
+    
+    Args:
+        cards_dir (str): Directory containing the card markdown files
+        max_workers (int): Number of concurrent reads (default 16)
+    
+    Returns:
+        list: (filename, content) tuples sorted by filename
+    """
+    card_paths = sorted(Path(cards_dir).glob('*.md'))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda path: (path.name, _read_card(path)), card_paths))
+
+
+def _read_card(path):
+    """Read a card file with a single buffered read and decode it once as UTF-8."""
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+def parse_simple_front_matter(front_matter_str):
+    """
+    Parse "key: value" front matter lines without a YAML parser.
+    Indented lines following a key (YAML "|" block style) are joined onto that key.
+    
+    Args:
+        front_matter_str (str): Front matter text between the '---' markers
+    
+    Returns:
+        dict: Mapping of front matter keys to string values
+    """
+    return {
+        key: (('' if value in ('|', '>') else value)
+              + '\n'.join(line.strip() for line in block.split('\n'))).strip()
+        for key, value, block in FRONT_MATTER_LINE_RE.findall(front_matter_str)
+    }
+
+
+def parse_front_matter(content):
+    """
+    Extract the YAML front matter from a card markdown file.
+    
+    Args:
+        content (str): Full markdown file content
+    
+    Returns:
+        dict: Front matter values, or an empty dict if the file has none
+    """
+    parts = content.split('---', 2)
+    if not content.startswith('---') or len(parts) != 3:
+        return {}
+    
+    front_matter_str = parts[1]
+    front_matter = parse_simple_front_matter(front_matter_str)
+    try:
+        loaded = yaml.load(front_matter_str, Loader=YamlLoader)
+    except yaml.YAMLError:
+        # Free-text answers are not always valid YAML (e.g. "Note: ..." inside a value)
+        return front_matter
+    if not isinstance(loaded, dict):
+        return front_matter
+    
+    # Free-text answers are written unquoted, so YAML syntax inside a plain value
+    # ("NSF #1 priority", "[NSF, USDA]") would silently change it. Keep the verbatim
+    # line values and only take block (|, >) and quoted values from YAML.
+    raw_values = {key: value for key, value, _ in FRONT_MATTER_LINE_RE.findall(front_matter_str)}
+    for key, value in loaded.items():
+        if isinstance(value, str) and raw_values.get(key, '')[:1] in ('|', '>', '"', "'"):
+            front_matter[key] = value
+    return front_matter
+
+
+def select_latex_engine(latex_template_path):
+    """
+    Choose the LaTeX engine a template needs, so it only has to be run once.
+    Templates that load fontspec, unicode-math or polyglossia need xelatex;
+    everything else is compiled with pdflatex.
+    
+    Args:
+        latex_template_path (str): Path to the LaTeX template
+    
+    Returns:
+        str: Name of the LaTeX engine ('pdflatex' or 'xelatex')
+    """
+    with open(latex_template_path, 'r') as f:
+        template_content = f.read()
+    if XELATEX_PACKAGES_RE.search(template_content):
+        return 'xelatex'
+    return 'pdflatex'
+
+
+def run_latex(tex_path, output_dir, engine='pdflatex', cwd=None):
+    """
+    Compile a single LaTeX file to PDF.
+    Uses latexmk when it is installed, which runs only as many passes as the
+    document needs; otherwise the engine is run directly once.
+
+    Args:
+        tex_path (str): Path to the .tex file (relative to cwd if given)
+        output_dir (str): Directory the PDF should be written to
+        engine (str): LaTeX engine to use ('pdflatex' or 'xelatex')
+        cwd (str, optional): Working directory for the LaTeX process
+
+    Returns:
+        subprocess.CompletedProcess: Result of the LaTeX run
+    """
+    if shutil.which('latexmk'):
+        engine_flag = '-pdf' if engine == 'pdflatex' else f'-{engine}'
+        latex_cmd = ['latexmk', engine_flag, '-interaction=nonstopmode', f'-output-directory={output_dir}', tex_path]
+    else:
+        latex_cmd = [engine, '-interaction=nonstopmode', '-output-directory', output_dir, tex_path]
+    return subprocess.run(latex_cmd, check=False, capture_output=True, text=True, cwd=cwd)
+
+
+def _card_pdf_is_current(pdf_path, stub_path, qr_path):
+    """
+    Check whether a card's compiled PDF can be reused.
+    The PDF and its stub must exist, and the PDF must not be older than the card's
+    QR image: the stub only names the image, so a regenerated QR code changes
+    nothing else about the card.
+    
+    Args:
+        pdf_path (str): Path to the card's compiled PDF
+        stub_path (str): Path to the card's LaTeX stub
+        qr_path (str): Path to the QR code image the card includes
+    
+    Returns:
+        bool: True if the PDF is up to date, False if the card must be recompiled
+    """
+    try:
+        pdf_mtime = os.stat(pdf_path).st_mtime_ns
+        os.stat(stub_path)
+    except OSError:
+        return False
+    try:
+        return os.stat(qr_path).st_mtime_ns <= pdf_mtime
+    except OSError:
+        # Missing QR image: LaTeX reports it, there is no newer file to pick up
+        return True
+
+
+def compile_cards_parallel(cards_data, latex_template_path, output_pdf_path, engine='pdflatex', max_workers=None):
+    """
+    Typeset every card as its own LaTeX document in parallel, then merge the
+    per-card PDFs into one printable document using the pdfpages package.
+
+    Per-card files are kept in a `card_pages` directory next to the output PDF,
+    and the rendered LaTeX for each card is cached in `.card_cache.json`, so
+    cards that are unchanged since the previous run are neither re-rendered
+    nor recompiled.
+
+    Args:
+        cards_data (list): List of card dictionaries used to render the template
+        latex_template_path (str): Path to the LaTeX template
+        output_pdf_path (str): Path to save the merged PDF
+        engine (str): LaTeX engine to use ('pdflatex' or 'xelatex')
+        max_workers (int, optional): Number of parallel pdflatex processes (default: CPU count)
+
+    Returns:
+        bool: True if the merged PDF was created, False otherwise
+    """
+    output_dir = os.path.dirname(output_pdf_path) or '.'
+    pages_dir = os.path.join(output_dir, 'card_pages')
+    os.makedirs(pages_dir, exist_ok=True)
+
+    # Rendered stubs from earlier runs, keyed by a hash of the template and card data
+    cache_path = os.path.join(output_dir, CARD_CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    with open(latex_template_path, 'rb') as f:
+        template_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    # Render one stand-alone document per card
+    page_names = []
+    to_compile = []
+    stubs_to_write = []
+    new_cache = {}
+    for card in cards_data:
+        name = card['name']
+        stub_path = os.path.join(pages_dir, f"{name}.tex")
+        pdf_path = os.path.join(pages_dir, f"{name}.pdf")
+        qr_path = card.get('qr_code', '')
+        page_names.append(name)
+
+        card_key = json.dumps(card, sort_keys=True)
+        key = hashlib.blake2b(f"{template_hash}|{card_key}".encode('utf-8'), digest_size=16).hexdigest()
+        if key in cache:
+            new_cache[key] = cache[key]
+            # Unchanged card whose PDF is still there and current: nothing to render or compile
+            if _card_pdf_is_current(pdf_path, stub_path, qr_path):
+                continue
+            stub = cache[key]
+        else:
+            stub = render_template(latex_template_path, {'cards': [card]})
+            new_cache[key] = stub
+
+        # Skip cards whose stub matches the one that produced the existing PDF
+        stub_bytes = stub.encode('utf-8')
+        if _card_pdf_is_current(pdf_path, stub_path, qr_path):
+            if Path(stub_path).read_bytes() == stub_bytes:
+                continue
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)
+
+        stubs_to_write.append((stub_path, stub_bytes))
+        to_compile.append(stub_path)
+
+    with open(cache_path, 'w') as f:
+        json.dump(new_cache, f)
+
+    # Write all changed stubs in one batch, overlapping the small file writes
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda item: Path(item[0]).write_bytes(item[1]), stubs_to_write))
+
+    print(f"Compiling {len(to_compile)} of {len(page_names)} cards with {engine}...")
+
+    # LaTeX does the work in a child process, so threads are enough to run
+    # one typesetting process per core
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        results = list(executor.map(lambda path: run_latex(path, pages_dir, engine), to_compile))
+
+    for stub_path, result in zip(to_compile, results):
+        if not os.path.exists(os.path.splitext(stub_path)[0] + '.pdf'):
+            print(f"LaTeX compilation failed for: {stub_path}")
+            if result.stdout:
+                print(f"LaTeX output: {result.stdout[-2000:]}")
+            return False
+
+    # Merge the per-card PDFs into a single document
+    merged_tex = '\n'.join(
+        [r'\documentclass{article}', r'\usepackage{pdfpages}', r'\begin{document}']
+        + [rf'\includepdf[pages=-,fitpaper]{{{name}.pdf}}' for name in page_names]
+        + [r'\end{document}', '']
+    )
+    merged_name = 'printable_cards_merged'
+    with open(os.path.join(pages_dir, f"{merged_name}.tex"), 'w') as f:
+        f.write(merged_tex)
+
+    merged_pdf = os.path.join(pages_dir, f"{merged_name}.pdf")
+    if os.path.exists(merged_pdf):
+        os.remove(merged_pdf)
+    result = run_latex(f"{merged_name}.tex", '.', engine, cwd=pages_dir)
+
+    if not os.path.exists(merged_pdf):
+        print("Merging card PDFs with pdfpages failed.")
+        if result.stdout:
+            print(f"LaTeX output: {result.stdout[-2000:]}")
+        return False
+
+    # card_pages lives inside the output directory, so this is a same-filesystem rename
+    os.replace(merged_pdf, output_pdf_path)
+    return True
 
 
 def generate_latex(cards_dir, latex_template_path, output_pdf_path, qr_codes_dir):
@@ -130,110 +451,94 @@ def generate_latex(cards_dir, latex_template_path, output_pdf_path, qr_codes_dir
                 f.write(default_latex_template)
             print(f"✅ Created default LaTeX template at: {latex_template_path}")
         
-        # Get list of card markdown files
-        card_files = sorted([f for f in os.listdir(cards_dir) if f.endswith('.md')])
+        # Read all card markdown files
+        card_contents = read_card_files(cards_dir)
         
-        # Extract card data from markdown files
-        cards_data = []
-        for card_file in card_files:
-            card_path = os.path.join(cards_dir, card_file)
-            
-            # Parse the markdown file
-            with open(card_path, 'r') as f:
-                content = f.read()
-            
-            # Extract front matter
-            front_matter = {}
-            if content.startswith('---'):
-                _, front_matter_str, _ = content.split('---', 2)
-                for line in front_matter_str.strip().split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        front_matter[key.strip()] = value.strip()
-            
-            # Get QR code path
-            qr_filename = front_matter.get('qr_code_filename', '')
-            qr_path = os.path.join(qr_codes_dir, qr_filename)
-            
-            # Check if QR code exists; use placeholder if it doesn't
-            if not os.path.exists(qr_path):
-                print(f"⚠️ QR code image not found: {qr_path}")
-                qr_path = qr_filename  # Just use the filename and let LaTeX handle missing files
-
-            # Clean text fields by removing pipe characters from YAML block style
-            def clean_text(text):
-                if text:
-                    return text.replace('|', '').strip()
-                return ''
-
-            # Create card data structure
-            card_data = {
-                'title': front_matter.get('title', f"Card {card_file}"),
-                'contact': front_matter.get('contact', ''),
-                'description': clean_text(front_matter.get('description', '')),
-                'funders': front_matter.get('funders', ''),
-                'feasible_3yr': front_matter.get('feasible_3yr', ''),
-                'opportunities': clean_text(front_matter.get('opportunities', '')),
-                'challenges': clean_text(front_matter.get('challenges', '')),
-                'qr_code': qr_path
-            }
-            
-            cards_data.append(card_data)
+        # Extract front matter from markdown files
+        rows = []
+        for card_file, content in card_contents:
+            front_matter = parse_front_matter(content)
+            front_matter['name'] = os.path.splitext(card_file)[0]
+            front_matter.setdefault('title', f"Card {card_file}")
+            rows.append(front_matter)
+        
+        # Clean all cards at once, one column at a time
+        # (pandas is imported here so the CLI starts without loading it)
+        import pandas as pd
+        df = pd.DataFrame(rows).reindex(columns=CARD_FIELDS + ['qr_code_filename', 'qr_code']).fillna('')
+        for col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+        
+        # Get QR code filenames; the default card template stores them under "qr_code"
+        qr_filenames = df['qr_code_filename'].where(df['qr_code_filename'] != '', df['qr_code'])
+        qr_paths = os.path.join(qr_codes_dir, '') + qr_filenames
+        
+        # Check if QR codes exist with a single directory listing instead of one stat per card;
+        # just use the filename and let LaTeX handle missing files
+        qr_index = set()
+        if os.path.isdir(qr_codes_dir):
+            with os.scandir(qr_codes_dir) as it:
+                qr_index = {entry.name for entry in it}
+        qr_found = qr_filenames.isin(qr_index)
+        for qr_path in qr_paths[~qr_found]:
+            print(f"⚠️ QR code image not found: {qr_path}")
+        df['qr_code'] = qr_paths.where(qr_found, qr_filenames)
+        
+        # Feasibility answers repeat across cards ("Yes", "No", ...); share one string per answer
+        df['feasible_3yr'] = df['feasible_3yr'].map(sys.intern)
+        
+        cards_data = df.drop(columns='qr_code_filename').to_dict('records')
         
         # Prepare context for LaTeX template
         context = {'cards': cards_data}
         
-        # Render the LaTeX template
-        latex_content = render_template(latex_template_path, context)
-        
-        # Write the LaTeX file
+        # Render the LaTeX template directly into the LaTeX file
         output_dir = os.path.dirname(output_pdf_path)
         os.makedirs(output_dir, exist_ok=True)
         
         latex_output_path = os.path.join(output_dir, 'printable_cards.tex')
-        with open(latex_output_path, 'w') as f:
-            f.write(latex_content)
+        render_template_to_file(latex_template_path, context, latex_output_path)
         
         print(f"✅ Generated LaTeX file: {latex_output_path}")
         
-        # Compile LaTeX to PDF using pandoc
-        try:
-            # Check if pandoc is installed
-            subprocess.run(['pandoc', '--version'], check=True, capture_output=True)
-            
-            # Run pandoc
-            print(f"Running pandoc to generate PDF...")
-            
-            # First, try using pdflatex directly for better error messages
+        # Decide the LaTeX engine up front and typeset the cards with it once
+        engine = select_latex_engine(latex_template_path)
+        if shutil.which(engine):
             try:
-                print("Trying direct LaTeX compilation first...")
-                latex_cmd = ['pdflatex', '-interaction=nonstopmode', '-output-directory', os.path.dirname(output_pdf_path), latex_output_path]
-                latex_result = subprocess.run(latex_cmd, check=False, capture_output=True, text=True)
-                
-                # If successful, we'll have a PDF with the same base name as the .tex file
-                pdf_from_latex = os.path.splitext(latex_output_path)[0] + '.pdf'
-                if os.path.exists(pdf_from_latex):
-                    # Rename to the desired output path if they're different
-                    if pdf_from_latex != output_pdf_path:
-                        shutil.move(pdf_from_latex, output_pdf_path)
-                    print(f"✅ Generated PDF file with pdflatex: {output_pdf_path}")
+                if compile_cards_parallel(cards_data, latex_template_path, output_pdf_path, engine):
+                    print(f"✅ Generated PDF file with {engine}: {output_pdf_path}")
                     return True
-                else:
-                    # Print LaTeX errors for debugging
-                    if latex_result.stderr:
-                        print(f"LaTeX errors: {latex_result.stderr}")
-                    print("Direct LaTeX compilation failed, trying pandoc...")
             except Exception as e:
                 print(f"LaTeX compilation attempt failed: {e}")
-                print("Falling back to pandoc...")
             
-            # Fall back to pandoc if direct LaTeX compilation failed
+            print(f"❌ PDF generation failed with {engine}.")
+            print("The LaTeX file was generated successfully and is available at:")
+            print(f"  {latex_output_path}")
+            print(f"You can try to compile it manually with: {engine} -interaction=nonstopmode", latex_output_path)
+            return False
+        
+        # Without that engine on the PATH, let pandoc typeset the file with another
+        # installed engine; pandoc cannot produce a PDF without one either
+        fallback_engine = next((e for e in LATEX_ENGINES if e != engine and shutil.which(e)), None)
+        if fallback_engine is None:
+            print(f"⚠️ No LaTeX engine found ({engine} is needed). Please install LaTeX to generate the PDF.")
+            print(f"LaTeX file was generated at: {latex_output_path}")
+            return True  # Return true anyway since the LaTeX was generated
+        
+        try:
+            # Check if pandoc is installed
+            if shutil.which('pandoc') is None:
+                raise FileNotFoundError('pandoc')
+            
+            # Run pandoc
+            print(f"{engine} not found, running pandoc with {fallback_engine} to generate PDF...")
+            
             try:
                 pandoc_cmd = [
                     'pandoc', 
                     latex_output_path, 
                     '-o', output_pdf_path,
-                    '--pdf-engine=xelatex'
+                    f'--pdf-engine={fallback_engine}'
                 ]
                 
                 # Execute pandoc with verbose output
@@ -252,11 +557,11 @@ def generate_latex(cards_dir, latex_template_path, output_pdf_path, qr_codes_dir
                 if result.stderr:
                     print(f"Pandoc warnings/errors: {result.stderr}")
                     
-                # If we've reached here, both methods failed
-                print("❌ PDF generation failed with both LaTeX and pandoc.")
+                # If we've reached here, pandoc failed
+                print("❌ PDF generation failed with pandoc.")
                 print("The LaTeX file was generated successfully and is available at:")
                 print(f"  {latex_output_path}")
-                print("You can try to compile it manually with: pdflatex -interaction=nonstopmode", latex_output_path)
+                print(f"You can try to compile it manually with: {engine} -interaction=nonstopmode", latex_output_path)
                 return False
                 
             except FileNotFoundError:
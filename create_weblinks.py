@@ -5,6 +5,11 @@ import pandas as pd
 from pathlib import Path
 import csv
 
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; pandas' own CSV reader is used instead
+    pa = None
+
 
 def create_weblink(lat, lon, zoom=18):
     """
@@ -21,7 +26,24 @@ def create_weblink(lat, lon, zoom=18):
     return f"https://www.google.com/maps?q={lat},{lon}&t=k&z={zoom}"
 
 
-def process_csv(input_file, output_file=None, zoom=18):
+def read_csv(path, **kwargs):
+    """
+    Read a CSV file into a DataFrame, using the multithreaded PyArrow parser when installed.
+    Columns keep pandas' default NumPy dtypes, which the rest of the pipeline expects.
+    
+    Args:
+        path (str): Path to the CSV file
+        **kwargs: Extra arguments passed to pandas.read_csv
+    
+    Returns:
+        pandas.DataFrame: The CSV contents
+    """
+    if pa is not None:
+        kwargs.setdefault('engine', 'pyarrow')
+    return pd.read_csv(path, **kwargs)
+
+
+def process_csv(input_file, output_file=None, zoom=18, return_df=False, df=None):
     """
     Process the input CSV file to create weblinks based on coordinates.
     
@@ -29,38 +51,47 @@ def process_csv(input_file, output_file=None, zoom=18):
         input_file (str): Path to input CSV file
         output_file (str, optional): Path to output CSV file. If not provided, will use '<input>_with_links.csv'
         zoom (int): Zoom level for the Google Maps URL (default 18)
+        return_df (bool): Also return the DataFrame with the WebLink column, so later
+            steps do not have to read the output CSV again (default False)
+        df (pandas.DataFrame, optional): Already-loaded input data; input_file is then
+            only used to name the output file
     
     Returns:
-        str: Path to the output CSV file
+        str: Path to the output CSV file, or (path, DataFrame) if return_df is True
     """
+    failed = (None, None) if return_df else None
+    
     # Determine output filename if not provided
     if output_file is None:
         input_path = Path(input_file)
         output_file = f"{input_path.stem}_with_links{input_path.suffix}"
     
-    # Read the CSV file
-    try:
-        df = pd.read_csv(input_file)
-    except Exception as e:
-        print(f"L Error reading CSV file: {e}")
-        return None
+    # Read the CSV file unless the data was passed in
+    if df is None:
+        try:
+            df = read_csv(input_file)
+        except Exception as e:
+            print(f"L Error reading CSV file: {e}")
+            return failed
     
     # Validate required columns
     if 'x' not in df.columns or 'y' not in df.columns:
         print("L Error: Input CSV must contain 'x' and 'y' columns for coordinates")
-        return None
+        return failed
     
-    # Create the weblinks column
-    df['WebLink'] = df.apply(lambda row: create_weblink(row['y'], row['x'], zoom), axis=1)
+    # Create the weblinks column with vectorized string concatenation
+    # (same format as create_weblink, without calling it once per row)
+    df['WebLink'] = ('https://www.google.com/maps?q=' + df['y'].astype(str) + ','
+                     + df['x'].astype(str) + f'&t=k&z={zoom}')
     
     # Save the updated CSV
     try:
         df.to_csv(output_file, index=False)
-        print(f" Generated web links and saved to: {output_file}")
-        return output_file
+        print(f" Generated web links and saved to: {output_file}")
+        return (output_file, df) if return_df else output_file
     except Exception as e:
         print(f"L Error saving output CSV: {e}")
-        return None
+        return failed
 
 
 def main():
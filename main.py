@@ -15,14 +15,31 @@ To use this script:
 """
 
 import os
+import re
 import sys
-import pandas as pd
 import argparse
 import shutil
-from pathlib import Path
-import qrgen
-import create_weblinks
+from concurrent.futures import ThreadPoolExecutor
 
+# pandas, qrgen and create_weblinks (which pulls in pandas) are imported inside
+# the functions that use them, so `python main.py` without arguments starts fast
+
+
+# Variables that can be used in the card template as {{name}}
+CARD_PLACEHOLDERS = ('title', 'contact_person', 'contact', 'description', 'potential_funders', 'funders',
+                     'feasibility_next_3_years', 'feasible_3yr', 'opportunities', 'challenges',
+                     'qr_code_filename', 'qr_code')
+PLACEHOLDER_RE = re.compile(r'\{\{(' + '|'.join(CARD_PLACEHOLDERS) + r')\}\}')
+
+# Input CSV column feeding each group of card placeholders
+CARD_COLUMNS = (
+    ('Your Name', ('contact_person', 'contact')),
+    ('Describe the opportunity', ('description',)),
+    ('Who might be a potential funder of this work?', ('potential_funders', 'funders')),
+    ('Is the opportunity feasible in the next 3 years?', ('feasibility_next_3_years', 'feasible_3yr')),
+    ('What do you expect would go smoothly?', ('opportunities',)),
+    ('What would you expect to be challenging?', ('challenges',)),
+)
 
 def check_file_exists(file_path, template_content=None, description=None):
     """
@@ -52,43 +69,46 @@ def check_file_exists(file_path, template_content=None, description=None):
     return True
 
 
-def validate_csv_headers(csv_path, required_headers):
+def validate_csv_headers(csv_source, required_headers):
     """
     Validate that a CSV file contains the required headers.
     Performs fuzzy matching with CSV headers to account for minor differences like trailing spaces.
     
     Args:
-        csv_path (str): Path to the CSV file
+        csv_source (str or pandas.DataFrame): Path to the CSV file, or already-loaded data
         required_headers (list): List of required header names
     
     Returns:
         bool: True if all required headers are present, False otherwise
         dict: Mapping of actual headers to required headers
     """
+    import pandas as pd
+    
     try:
-        df = pd.read_csv(csv_path)
-        actual_headers = df.columns.tolist()
+        if isinstance(csv_source, pd.DataFrame):
+            actual_headers = csv_source.columns.tolist()
+        else:
+            # Only the header row is needed here, so don't parse the rest of the file
+            actual_headers = pd.read_csv(csv_source, nrows=0).columns.tolist()
+        
+        # Index the actual headers once by their normalized forms (first one wins)
+        by_exact = set(actual_headers)
+        by_lower = {}
+        by_strip = {}
+        for actual in actual_headers:
+            by_lower.setdefault(actual.lower(), actual)
+            by_strip.setdefault(actual.strip(), actual)
         
         # Create header mapping (handling minor differences like spaces)
         header_mapping = {}
         for required in required_headers:
-            # Try exact match first
-            if required in actual_headers:
+            # Try exact match first, then case-insensitive, then ignoring whitespace
+            if required in by_exact:
                 header_mapping[required] = required
                 continue
-                
-            # Try case-insensitive match
-            for actual in actual_headers:
-                if required.lower() == actual.lower():
-                    header_mapping[actual] = required
-                    break
-                    
-            # Try match ignoring whitespace
-            if required not in header_mapping.values():
-                for actual in actual_headers:
-                    if required.strip() == actual.strip():
-                        header_mapping[actual] = required
-                        break
+            actual = by_lower.get(required.lower()) or by_strip.get(required.strip())
+            if actual is not None:
+                header_mapping[actual] = required
         
         # Find missing headers
         missing_headers = [h for h in required_headers if h not in header_mapping.values()]
@@ -129,50 +149,35 @@ def validate_csv_headers(csv_path, required_headers):
         return False, {}
 
 
-def create_qr_codes(input_csv, qr_dir, weblinks_csv):
+def create_qr_codes(df, qr_dir):
     """
-    Generate QR codes for each entry in the input CSV.
+    Generate QR codes for each entry in the input data.
     
     Args:
-        input_csv (str): Path to input CSV with weblinks
-        qr_dir (str): Directory to store QR codes
-        weblinks_csv (str): Path to CSV with weblinks
+        df (pandas.DataFrame): Input data with OBJECTID and WebLink columns
+        qr_dir (str): Existing directory to store QR codes
     
     Returns:
         bool: True if successful, False otherwise
     """
-    # Ensure QR code directory exists
-    os.makedirs(qr_dir, exist_ok=True)
+    import pandas as pd
+    import qrgen
     
     try:
-        # Read the CSV with weblinks
-        df = pd.read_csv(weblinks_csv)
+        weblinks = df['WebLink'].tolist()
+        qr_filenames = (qr_dir + '/qr_' + df['OBJECTID'].astype(str) + '.png').tolist()
         
-        # Create a DataFrame to store QR code metadata
-        qr_metadata = {
-            'OBJECTID': [],
-            'WebLink': [],
-            'QR_Code_Filename': []
-        }
+        # Generate QR codes for each entry; encoding is CPU-bound, so spread it over all cores
+        qrgen.generate_many(zip(weblinks, qr_filenames), workers=os.cpu_count())
         
-        # Generate QR codes for each entry
-        for _, row in df.iterrows():
-            object_id = row['OBJECTID']
-            weblink = row['WebLink']
-            
-            # Create QR code filename
-            qr_filename = f"{qr_dir}/qr_{object_id}.png"
-            
-            # Generate the QR code
-            qrgen.generate_qr_code(weblink, qr_filename)
-            
-            # Add to metadata
-            qr_metadata['OBJECTID'].append(object_id)
-            qr_metadata['WebLink'].append(weblink)
-            qr_metadata['QR_Code_Filename'].append(qr_filename)
+        # Build the QR code metadata straight from the input columns
+        metadata_df = pd.DataFrame({
+            'OBJECTID': df['OBJECTID'].values,
+            'WebLink': df['WebLink'].values,
+            'QR_Code_Filename': qr_filenames
+        })
         
         # Save metadata to CSV
-        metadata_df = pd.DataFrame(qr_metadata)
         metadata_csv = f"{qr_dir}/qr_metadata.csv"
         metadata_df.to_csv(metadata_csv, index=False)
         
@@ -186,64 +191,88 @@ def create_qr_codes(input_csv, qr_dir, weblinks_csv):
         return False
 
 
-def create_card_markdown_files(input_csv, weblinks_csv, qr_dir, card_template_path, output_dir):
+def compile_card_template(template):
+    """
+    Compile a card template into a function that fills in its placeholders.
+    The template is scanned once here instead of once per placeholder per card.
+    
+    Args:
+        template (str): Card template text with {{placeholder}} variables
+    
+    Returns:
+        callable: Function taking a dict of placeholder values and returning the card text
+    """
+    # Split on known placeholders in one regex pass; odd items are placeholder names.
+    # Literal text gets its braces escaped and each placeholder becomes a format field.
+    parts = PLACEHOLDER_RE.split(template)
+    format_string = ''.join('{' + part + '}' if i % 2 else part.replace('{', '{{').replace('}', '}}')
+                            for i, part in enumerate(parts))
+    return format_string.format_map
+
+
+def _write_card(card):
+    """Write a single card markdown file from a (filename, content) tuple"""
+    card_filename, card_content = card
+    # Encode once and write the bytes through a buffered binary file, which
+    # keeps writing until the whole card is on disk
+    with open(card_filename, 'wb') as f:
+        f.write(card_content.encode('utf-8'))
+
+
+def create_card_markdown_files(df, qr_dir, card_template_path, output_dir):
     """
     Create markdown files for each card based on the template.
     
     Args:
-        input_csv (str): Path to input CSV
-        weblinks_csv (str): Path to CSV with weblinks
+        df (pandas.DataFrame): Input data with weblinks
         qr_dir (str): Directory containing QR codes
         card_template_path (str): Path to card template markdown
-        output_dir (str): Directory to store output card markdown files
+        output_dir (str): Existing directory to store output card markdown files
     
     Returns:
         bool: True if successful, False otherwise
     """
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    import pandas as pd
     
     try:
-        # Read the weblinks CSV
-        df = pd.read_csv(weblinks_csv)
-        
-        # Read the card template
+        # Read the card template and compile it once for all cards
         with open(card_template_path, 'r') as f:
-            template = f.read()
+            render_card = compile_card_template(f.read())
         
         card_files = []
         
+        # Pull each column out as a list of strings once; missing columns and empty cells become ''
+        empty = pd.Series([''] * len(df), index=df.index)
+        columns = [(placeholders, df.get(name, empty).astype('string').fillna('').tolist())
+                   for name, placeholders in CARD_COLUMNS]
+        
+        # Build the per-card names with vectorized string operations
+        object_ids = df['OBJECTID'].astype(str)
+        qr_names = 'qr_' + object_ids + '.png'
+        titles = ('Project ' + object_ids).tolist()
+        qr_code_filenames = qr_names.tolist()
+        qr_codes = ('./qr_codes/' + qr_names).tolist()
+        card_filenames = (output_dir + '/card_' + object_ids + '.md').tolist()
+        
         # Create a card file for each entry
-        for _, row in df.iterrows():
-            object_id = row['OBJECTID']
-            
+        for i, card_filename in enumerate(card_filenames):
             # Create variable mapping for template
             variables = {
-                '{{title}}': f"Project {object_id}",
-                '{{contact_person}}': row.get('Your Name', ''),
-                '{{contact}}': row.get('Your Name', ''),
-                '{{description}}': row.get('Describe the opportunity', ''),
-                '{{potential_funders}}': row.get('Who might be a potential funder of this work?', ''),
-                '{{funders}}': row.get('Who might be a potential funder of this work?', ''),
-                '{{feasibility_next_3_years}}': row.get('Is the opportunity feasible in the next 3 years?', ''),
-                '{{feasible_3yr}}': row.get('Is the opportunity feasible in the next 3 years?', ''),
-                '{{opportunities}}': row.get('What do you expect would go smoothly?', ''),
-                '{{challenges}}': row.get('What would you expect to be challenging?', ''),
-                '{{qr_code_filename}}': f"qr_{object_id}.png",
-                '{{qr_code}}': f"./qr_codes/qr_{object_id}.png"
+                'title': titles[i],
+                'qr_code_filename': qr_code_filenames[i],
+                'qr_code': qr_codes[i]
             }
+            for placeholders, values in columns:
+                for placeholder in placeholders:
+                    variables[placeholder] = values[i]
             
-            # Replace variables in template
-            card_content = template
-            for key, value in variables.items():
-                card_content = card_content.replace(key, str(value) if value is not None else '')
-            
-            # Write card markdown file
-            card_filename = f"{output_dir}/card_{object_id}.md"
-            with open(card_filename, 'w') as f:
-                f.write(card_content)
-            
-            card_files.append(card_filename)
+            # Fill in the template
+            card_content = render_card(variables)
+            card_files.append((card_filename, card_content))
+        
+        # Write card markdown files, overlapping the small writes on a thread pool
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            list(executor.map(_write_card, card_files))
         
         print(f"✅ Created {len(card_files)} card markdown files in directory: {output_dir}")
         return True
@@ -272,19 +301,15 @@ All options:
   --qr-dir          Directory for QR code images (default: qr_codes)
   --zoom            Zoom level for Google Maps URLs (default: 18)
   --use-mapping     Use header_mapping.json file to map CSV headers
-  --skip-pdf        Skip PDF generation step (if pandoc is not installed)
+  --skip-pdf        Skip PDF generation step (if LaTeX is not installed)
 
 For more information, see README.md
 """
     print(welcome)
 
 
-def main():
-    # Show welcome message if no arguments are provided
-    if len(sys.argv) == 1:
-        display_welcome()
-        return True
-
+def _build_parser():
+    """Build the command line parser; only needed when arguments are given"""
     parser = argparse.ArgumentParser(description='Generate printable cards with QR codes')
     parser.add_argument('--input', '-i', type=str, default='20250107_Activity_1_0.csv',
                         help='Input CSV file with activity data')
@@ -299,12 +324,22 @@ def main():
     parser.add_argument('--use-mapping', action='store_true',
                         help='Use header mapping file (header_mapping.json) to map CSV headers')
     parser.add_argument('--skip-pdf', action='store_true',
-                        help='Skip PDF generation step (useful if pandoc is not installed)')
+                        help='Skip PDF generation step (useful if LaTeX is not installed)')
+    return parser
+
+
+def main():
+    # Show welcome message if no arguments are provided
+    if len(sys.argv) == 1:
+        display_welcome()
+        return True
     
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
+    import create_weblinks
     
-    # Create output directories
-    os.makedirs(args.output_dir, exist_ok=True)
+    # Create output directories once up front; the pipeline steps assume they exist
+    cards_dir = os.path.join(args.output_dir, 'cards')
+    os.makedirs(cards_dir, exist_ok=True)
     os.makedirs(args.qr_dir, exist_ok=True)
     
     # 1. Validate required files
@@ -318,7 +353,8 @@ def main():
                        'What do you expect would go smoothly?', 'What would you expect to be challenging?',
                        'Who might be a potential funder of this work?', 'x', 'y']
     
-    # Check if we should use a header mapping file
+    # Check if we should use a header mapping file; the mapped data is kept in memory
+    input_df = None
     if args.use_mapping:
         try:
             import json
@@ -326,24 +362,15 @@ def main():
                 header_mapping_file = json.load(f)
             print(f"✅ Loaded header mapping from 'header_mapping.json'")
             
-            # Create a temporary CSV with correct headers
-            df = pd.read_csv(args.input)
-            
-            # Rename columns according to the mapping
+            # Load the CSV and rename columns according to the mapping, in memory
+            input_df = create_weblinks.read_csv(args.input)
             for original, target in header_mapping_file.items():
-                if original in df.columns:
-                    df.rename(columns={original: target}, inplace=True)
-            
-            # Save to a temporary file
-            temp_csv = 'temp_mapped.csv'
-            df.to_csv(temp_csv, index=False)
-            
-            # Update input file path
-            args.input = temp_csv
-            print(f"✅ Created mapped CSV with correct headers at '{temp_csv}'")
+                if original in input_df.columns:
+                    input_df.rename(columns={original: target}, inplace=True)
+            print(f"✅ Applied header mapping to '{args.input}'")
             
-            # Run validation again on the mapped file
-            headers_valid, header_mapping = validate_csv_headers(args.input, required_headers)
+            # Run validation again on the mapped data
+            headers_valid, header_mapping = validate_csv_headers(input_df, required_headers)
             if not headers_valid:
                 print("❌ Even with mapping, some required headers are still missing.")
                 return False
@@ -384,19 +411,19 @@ def main():
             
             return False
     
-    # 3. Create links to web resource
-    weblinks_csv = create_weblinks.process_csv(args.input, None, args.zoom)
+    # 3. Create links to web resource; the DataFrame is reused by the next steps
+    weblinks_csv, df = create_weblinks.process_csv(args.input, None, args.zoom, return_df=True, df=input_df)
     if not weblinks_csv:
         return False
     
-    # 4. Create QR Codes
-    if not create_qr_codes(args.input, args.qr_dir, weblinks_csv):
-        return False
-    
-    # 5. Create card markdown files
-    cards_dir = os.path.join(args.output_dir, 'cards')
-    if not create_card_markdown_files(args.input, weblinks_csv, args.qr_dir, args.card_template, cards_dir):
-        return False
+    # 4./5. Create QR codes and card markdown files. The cards only need the QR
+    # file names, so they are written while the QR codes are still being encoded
+    # (create_qr_codes spreads the encoding over its own process pool).
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        qr_future = executor.submit(create_qr_codes, df, args.qr_dir)
+        cards_ok = create_card_markdown_files(df, args.qr_dir, args.card_template, cards_dir)
+        if not qr_future.result() or not cards_ok:
+            return False
     
     # 6. Generate the final PDF using create_cards.py
     output_pdf_path = os.path.join(args.output_dir, 'printable_cards.pdf')
@@ -408,30 +435,21 @@ def main():
     else:
         print("\nGenerating printable PDF from cards...")
         
-        # Check if pandoc is installed
-        pandoc_available = False
-        try:
-            result = subprocess.run(['pandoc', '--version'], 
-                                   check=False, 
-                                   capture_output=True, 
-                                   text=True)
-            pandoc_available = result.returncode == 0
-        except:
-            pandoc_available = False
-            
-        if not pandoc_available:
-            print("⚠️ Pandoc is not installed. PDF generation will be skipped.")
-            print("To install pandoc:")
-            print("  - macOS: brew install pandoc")
-            print("  - Ubuntu/Debian: sudo apt-get install pandoc")
-            print("  - Windows: choco install pandoc")
-            print("\nTo generate PDF after installing pandoc, run:")
+        # The cards are typeset by a LaTeX engine (pandoc is only a fallback driver
+        # for it), so check for one of those on the PATH
+        import create_cards
+        latex_available = any(shutil.which(engine) for engine in create_cards.LATEX_ENGINES)
+        
+        if not latex_available:
+            print("⚠️ LaTeX is not installed. PDF generation will be skipped.")
+            print("To install LaTeX:")
+            print("  - macOS: brew install --cask basictex")
+            print("  - Ubuntu/Debian: sudo apt-get install texlive-latex-extra")
+            print("  - Windows: install MiKTeX or TeX Live")
+            print("\nTo generate PDF after installing LaTeX, run:")
             print(f"  python create_cards.py --cards-dir {cards_dir} --output-pdf {output_pdf_path}")
         else:
             try:
-                # Import the module
-                import create_cards
-                
                 # Set up the LaTeX template path
                 latex_template_path = "layout_template.tex"
                 
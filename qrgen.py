@@ -1,10 +1,45 @@
 #!/usr/bin/env python3
 
-import qrcode
+import os
 import argparse
+import csv
+import shutil
+import hashlib
+from itertools import repeat
 from pathlib import Path
 
-def generate_qr_code(data: str, output_path: str, size: int = 10):
+# qrcode and Pillow are imported where they are needed, so importing this
+# module (or serving a code from the cache) doesn't pay for loading them
+
+# Fixed data mask. Any of the 8 masks gives a valid code; picking one skips
+# qrcode's penalty search over all of them, which is most of the encoding time.
+MASK_PATTERN = 0
+
+# Rendered PNGs are cached here by content, so repeated data is not re-encoded.
+# Bump CACHE_VERSION whenever the rendered image format changes.
+CACHE_VERSION = 2
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'qrgen'
+
+
+def _cache_path(data: str, size: int, fmt: str = 'png') -> Path:
+    """Path of the cached image for this data, size and format"""
+    key = hashlib.blake2b(f"{CACHE_VERSION}|{data}|{size}|{MASK_PATTERN}".encode('utf-8'), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.{fmt}"
+
+
+def _store_in_cache(image_path, cached: Path):
+    """Copy a rendered image into the cache; a cache that can't be written is skipped"""
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # Copy to a per-process temp name first so parallel workers never see partial files
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        shutil.copyfile(image_path, tmp)
+        os.replace(tmp, cached)
+    except OSError:
+        pass
+
+
+def generate_qr_code(data: str, output_path: str, size: int = 10, cache: bool = True, fmt: str = 'png'):
     """
     Generate a QR code from a string and save it as an image.
 
@@ -12,28 +47,110 @@ def generate_qr_code(data: str, output_path: str, size: int = 10):
         data (str): The data to encode in the QR code.
         output_path (str): File path to save the QR code image (e.g., 'output.png').
         size (int): Controls the size of the QR code (default 10).
+        cache (bool): Reuse/store the rendered image in CACHE_DIR (default True).
+        fmt (str): Image format, 'png' or 'svg' (default 'png').
     """
+    cached = _cache_path(data, size, fmt) if cache else None
+
+    # Write under a temporary name and rename into place, so an interrupted
+    # run never leaves a truncated image at output_path
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        if cached is not None and cached.exists():
+            shutil.copyfile(cached, tmp_path)
+        else:
+            _render(data, tmp_path, size, fmt)
+            if cached is not None:
+                _store_in_cache(tmp_path, cached)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    print(f"✅ QR code saved to: {output_path}")
+
+def _render(data: str, output_path: str, size: int, fmt: str):
+    """Encode data as a QR code and save it in the given format"""
+    import qrcode
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_M,
         box_size=size,
         border=4,
+        mask_pattern=MASK_PATTERN,
     )
     qr.add_data(data)
     qr.make(fit=True)
 
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(output_path)
-    print(f"✅ QR code saved to: {output_path}")
+    if fmt == 'svg':
+        # A single <path> for all dark modules; no raster encoding at all
+        from qrcode.image.svg import SvgPathImage
+        qr.make_image(image_factory=SvgPathImage).save(str(output_path))
+    else:
+        _save_png(qr.modules, output_path, size, qr.border)
+
+def _save_png(modules, output_path, size: int, border: int):
+    """Save a module matrix (without its quiet zone) as a 1-bit PNG"""
+    from PIL import Image, ImageOps
+    # Draw one pixel per module and scale up with a nearest-neighbour resize,
+    # instead of letting the image factory draw every module as a rectangle;
+    # the white quiet zone is added afterwards as a plain border
+    width = len(modules)
+    pixels = bytes(0 if module else 255 for row in modules for module in row)
+    img = Image.frombytes('L', (width, width), pixels).convert('1', dither=Image.Dither.NONE)
+    img = img.resize((width * size, width * size), Image.NEAREST)
+    img = ImageOps.expand(img, border=border * size, fill=255)
+    # Mode '1' is written as a 1-bit greyscale PNG, an eighth of the raw data of 'L';
+    # maximum DEFLATE effort then trims the already tiny file a little further
+    img.save(output_path, format='PNG', optimize=True, compress_level=9)
+
+def generate_many(pairs, size: int = 10, workers: int = None, cache: bool = True, fmt: str = 'png'):
+    """
+    Generate many QR codes in parallel across worker processes.
+
+    Args:
+        pairs (iterable): (data, output_path) tuples, one per QR code.
+        size (int): Controls the size of the QR codes (default 10).
+        workers (int, optional): Number of worker processes (default: one per CPU).
+        cache (bool): Reuse/store the rendered images in CACHE_DIR (default True).
+        fmt (str): Image format, 'png' or 'svg' (default 'png').
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    pairs = list(pairs)
+    data = [d for d, _ in pairs]
+    paths = [p for _, p in pairs]
+    # Callers may have other threads running (main.py writes cards meanwhile); a worker
+    # forked while one of them holds a lock such as stdout's would hang, so never fork
+    # from this process directly
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        list(executor.map(generate_qr_code, data, paths, repeat(size), repeat(cache), repeat(fmt),
+                          chunksize=16))
 
 def main():
     parser = argparse.ArgumentParser(description="Generate a QR code from a string.")
-    parser.add_argument("data", help="The string to encode into the QR code.")
-    parser.add_argument("output", type=Path, help="Output image file (e.g., qr.png)")
+    parser.add_argument("data", nargs="?", help="The string to encode into the QR code.")
+    parser.add_argument("output", nargs="?", type=Path, help="Output image file (e.g., qr.png or qr.svg)")
     parser.add_argument("--size", type=int, default=10, help="Box size for the QR code")
+    parser.add_argument("--batch", type=Path,
+                        help="CSV file of data,output rows (no header) to generate in parallel")
+    parser.add_argument("--workers", type=int, help="Worker processes for --batch (default: one per CPU)")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="Image format (default: png)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Don't use the QR image cache in {CACHE_DIR}")
 
     args = parser.parse_args()
-    generate_qr_code(args.data, args.output, args.size)
+    if args.batch:
+        with open(args.batch, newline='') as f:
+            pairs = [(row[0], row[1]) for row in csv.reader(f) if row]
+        generate_many(pairs, args.size, args.workers, not args.no_cache, args.format)
+    elif args.data and args.output:
+        generate_qr_code(args.data, args.output, args.size, not args.no_cache, args.format)
+    else:
+        parser.error("provide data and output, or --batch")
 
 if __name__ == "__main__":
     main()
@@ -9,8 +9,11 @@ Usage:
 
 import os
 import sys
+import csv
 from pathlib import Path
 import create_weblinks
+import create_cards
+import main as pipeline
 import qrgen
 
 # Define test directories
@@ -50,6 +53,130 @@ def test_create_weblinks():
     
     return True
 
+def test_process_csv():
+    """Test that process_csv builds the same links as create_weblink"""
+    print("\nTesting create_weblinks.process_csv...")
+    
+    input_csv = TEST_DIR / "coords.csv"
+    output_csv = TEST_DIR / "coords_with_links.csv"
+    coords = [(44.97368603, -93.4983819), (45.0, -93.25), (44.9, -93.0)]
+    with open(input_csv, 'w') as f:
+        f.write("OBJECTID,x,y\n")
+        for i, (lat, lon) in enumerate(coords):
+            f.write(f"{i},{lon},{lat}\n")
+    
+    result = create_weblinks.process_csv(str(input_csv), str(output_csv), zoom=15)
+    if result is None:
+        print("❌ process_csv failed")
+        return False
+    
+    with open(output_csv, newline='') as f:
+        links = [row['WebLink'] for row in csv.DictReader(f)]
+    expected = [create_weblinks.create_weblink(lat, lon, 15) for lat, lon in coords]
+    
+    if links == expected:
+        print(f"✅ {len(links)} links created correctly")
+        return True
+    else:
+        print(f"❌ Link mismatch: \nGot:      {links}\nExpected: {expected}")
+        return False
+
+def test_parse_front_matter():
+    """Test front matter parsing in create_cards.py"""
+    print("\nTesting create_cards.parse_front_matter...")
+    
+    content = (
+        "---\n"
+        "title: Project 6\n"
+        "feasible_3yr: Yes\n"
+        "opportunities: |\n"
+        "  Funding\n"
+        "---\n"
+        "## Front\n"
+    )
+    expected = {'title': 'Project 6', 'feasible_3yr': 'Yes', 'opportunities': 'Funding\n'}
+    front_matter = create_cards.parse_front_matter(content)
+    if front_matter != expected:
+        print(f"❌ Front matter mismatch: \nGot:      {front_matter}\nExpected: {expected}")
+        return False
+    print("✅ YAML front matter parsed correctly")
+    
+    # Values that are not valid YAML use the simple line parser
+    front_matter = create_cards.parse_front_matter(content.replace("Yes", "Yes: soon"))
+    if front_matter.get('feasible_3yr') != 'Yes: soon' or front_matter.get('opportunities') != 'Funding':
+        print(f"❌ Fallback parse mismatch: {front_matter}")
+        return False
+    print("✅ Non-YAML front matter parsed with fallback")
+    
+    # YAML comment and flow syntax inside unquoted answers is kept verbatim
+    front_matter = create_cards.parse_front_matter(
+        content.replace("Yes", "NSF #1 priority").replace("title: Project 6", "title: [NSF, USDA]"))
+    if front_matter.get('feasible_3yr') != 'NSF #1 priority' or front_matter.get('title') != '[NSF, USDA]':
+        print(f"❌ Verbatim value mismatch: {front_matter}")
+        return False
+    print("✅ YAML syntax inside plain values kept verbatim")
+    return True
+
+def test_card_pdf_is_current():
+    """Test that create_cards recompiles a card whose QR image changed"""
+    print("\nTesting create_cards._card_pdf_is_current...")
+    
+    pdf_path, stub_path, qr_path = (str(TEST_DIR / f"card_fresh.{ext}") for ext in ("pdf", "tex", "png"))
+    for path in (qr_path, stub_path, pdf_path):
+        Path(path).write_bytes(b"x")
+    os.utime(qr_path, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(pdf_path, ns=(2_000_000_000, 2_000_000_000))
+    current = create_cards._card_pdf_is_current(pdf_path, stub_path, qr_path)
+    
+    # A QR code regenerated after the PDF was compiled makes the PDF stale
+    os.utime(qr_path, ns=(3_000_000_000, 3_000_000_000))
+    stale = create_cards._card_pdf_is_current(pdf_path, stub_path, qr_path)
+    
+    if current and not stale:
+        print("✅ Card PDFs older than their QR image are recompiled")
+        return True
+    else:
+        print(f"❌ Card PDF freshness mismatch: current={current}, stale={stale}")
+        return False
+
+def test_compile_card_template():
+    """Test card template compilation in main.py"""
+    print("\nTesting main.compile_card_template...")
+    
+    template = "# {{title}}\n{literal} {{unknown}} ![QR]({{qr_code}})"
+    variables = {name: '' for name in pipeline.CARD_PLACEHOLDERS}
+    variables.update({'title': 'Project 6', 'qr_code': './qr_codes/qr_6.png'})
+    card = pipeline.compile_card_template(template)(variables)
+    expected = "# Project 6\n{literal} {{unknown}} ![QR](./qr_codes/qr_6.png)"
+    
+    if card == expected:
+        print("✅ Card template filled correctly")
+        return True
+    else:
+        print(f"❌ Card template mismatch: \nGot:      {card!r}\nExpected: {expected!r}")
+        return False
+
+def test_validate_csv_headers():
+    """Test header matching in main.validate_csv_headers"""
+    print("\nTesting main.validate_csv_headers...")
+    
+    test_csv = TEST_DIR / "headers.csv"
+    with open(test_csv, 'w') as f:
+        f.write("OBJECTID,your name,Describe the opportunity ,x,y\n")
+        f.write("6,Jane,Wetland,-93.5,44.9\n")
+    
+    required = ['OBJECTID', 'Your Name', 'Describe the opportunity', 'x', 'y']
+    valid, mapping = pipeline.validate_csv_headers(str(test_csv), required)
+    expected = {'OBJECTID': 'OBJECTID', 'your name': 'Your Name',
+                'Describe the opportunity ': 'Describe the opportunity', 'x': 'x', 'y': 'y'}
+    
+    if valid and mapping == expected:
+        print("✅ CSV headers matched correctly")
+        return True
+    else:
+        print(f"❌ Header mapping mismatch: \nGot:      {mapping!r}\nExpected: {expected!r}")
+        return False
+
 def test_qrgen():
     """Test the QR code generation module"""
     print("\nTesting qrgen.py...")
@@ -58,8 +185,8 @@ def test_qrgen():
     test_output = str(QR_DIR / "test_qr.png")
     
     try:
-        qrgen.generate_qr_code(test_url, test_output)
-        if os.path.exists(test_output):
+        qrgen.generate_qr_code(test_url, test_output, cache=False)
+        if Path(test_output).stat().st_size > 0:
             print(f"✅ QR code generated successfully at: {test_output}")
             return True
         else:
@@ -69,6 +196,83 @@ def test_qrgen():
         print(f"❌ Error generating QR code: {e}")
         return False
 
+def test_qrgen_cache():
+    """Test the rendered-image cache in qrgen.py"""
+    print("\nTesting qrgen cache...")
+    
+    test_url = "https://www.google.com/maps?q=44.9736,-93.4983&t=k&z=18"
+    original_cache_dir = qrgen.CACHE_DIR
+    # Keep the test cache out of the user's real one, and start it empty so the first call is a miss
+    qrgen.CACHE_DIR = TEST_DIR / "qr_cache"
+    for cached_file in qrgen.CACHE_DIR.glob("*"):
+        cached_file.unlink()
+    
+    try:
+        cached = qrgen._cache_path(test_url, 10)
+        qrgen.generate_qr_code(test_url, str(QR_DIR / "test_cache_miss.png"))
+        if not cached.exists():
+            print(f"❌ Cache miss did not store the image at: {cached}")
+            return False
+        
+        # Mark the cached copy so a hit can be told apart from a fresh render
+        cached.write_bytes(b"cached")
+        qrgen.generate_qr_code(test_url, str(QR_DIR / "test_cache_hit.png"))
+        qrgen.generate_qr_code(test_url, str(QR_DIR / "test_cache_off.png"), cache=False)
+        if (QR_DIR / "test_cache_hit.png").read_bytes() != b"cached":
+            print("❌ Cache hit did not reuse the cached image")
+            return False
+        if (QR_DIR / "test_cache_off.png").read_bytes() == b"cached":
+            print("❌ cache=False reused the cached image")
+            return False
+        
+        print("✅ QR cache miss, hit and cache=False behave as expected")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing the QR cache: {e}")
+        return False
+    finally:
+        qrgen.CACHE_DIR = original_cache_dir
+
+def test_qrgen_svg():
+    """Test SVG output in qrgen.py"""
+    print("\nTesting qrgen SVG output...")
+    
+    test_url = "https://www.google.com/maps?q=44.9736,-93.4983&t=k&z=18"
+    test_output = QR_DIR / "test_qr.svg"
+    
+    try:
+        qrgen.generate_qr_code(test_url, str(test_output), cache=False, fmt='svg')
+        if "<svg" in test_output.read_text(encoding='utf-8'):
+            print(f"✅ SVG QR code generated successfully at: {test_output}")
+            return True
+        else:
+            print(f"❌ No <svg> element in: {test_output}")
+            return False
+    except Exception as e:
+        print(f"❌ Error generating SVG QR code: {e}")
+        return False
+
+def test_qrgen_generate_many():
+    """Test batch QR code generation in qrgen.py"""
+    print("\nTesting qrgen.generate_many...")
+    
+    outputs = [str(QR_DIR / f"test_batch_{i}.png") for i in range(3)]
+    pairs = [(f"https://www.google.com/maps?q=44.97{i},-93.49&t=k&z=18", path)
+             for i, path in enumerate(outputs)]
+    
+    try:
+        qrgen.generate_many(pairs, workers=2, cache=False)
+        missing = [path for path in outputs if not os.path.exists(path)]
+        if not missing:
+            print(f"✅ Generated {len(outputs)} QR codes in a batch")
+            return True
+        else:
+            print(f"❌ Batch QR codes not found: {missing}")
+            return False
+    except Exception as e:
+        print(f"❌ Error generating QR codes in a batch: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("Running tests for TOOL_printable_cards_QR_code components\n")
@@ -77,7 +281,15 @@ def main():
     
     tests = [
         ("create_weblinks.py", test_create_weblinks),
-        ("qrgen.py", test_qrgen)
+        ("create_weblinks.process_csv", test_process_csv),
+        ("create_cards.parse_front_matter", test_parse_front_matter),
+        ("create_cards._card_pdf_is_current", test_card_pdf_is_current),
+        ("main.compile_card_template", test_compile_card_template),
+        ("main.validate_csv_headers", test_validate_csv_headers),
+        ("qrgen.py", test_qrgen),
+        ("qrgen cache", test_qrgen_cache),
+        ("qrgen SVG output", test_qrgen_svg),
+        ("qrgen.generate_many", test_qrgen_generate_many)
     ]
     
     results = []